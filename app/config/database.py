@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from sqlmodel import SQLModel, create_engine, Session
 
 DATABASE_URL = "sqlite:///./database.db"
@@ -6,8 +7,16 @@ engine = create_engine(DATABASE_URL, echo=True, connect_args={"check_same_thread
 def init_db():
     SQLModel.metadata.create_all(engine)
 
+@contextmanager
+def session_scope():
+    # One transaction per unit of work: repositories only stage changes, this commits them once
+    # (or rolls everything back if the block raises).
+    with Session(engine) as session, session.begin():
+        yield session
+
 def get_session():
-    with Session(engine) as session:
+    # Depend on this with scope="function" so the commit runs before the response is sent.
+    with session_scope() as session:
         yield session
 
 def get_engine():
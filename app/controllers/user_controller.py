@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Depends, Security, Header
+from fastapi import APIRouter, Depends, Security, Header, Response
 from fastapi.security import OAuth2PasswordBearer
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from sqlmodel import Session
 from typing import *
+from datetime import date
 from app.config.database import get_session
 from app.services.user_service import UserService
+from app.services.login_report_service import LoginReportService
 from app.utils.validators.user_validator import UserValidator
-from app.repositories.user_repository import UserRepository
+from app.repositories.user_repository import UserRepository, user_reads
 from app.models.user_model import User
 from app.utils import condition_cheacking
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +22,7 @@ user_router = APIRouter(prefix="/user", tags=["User"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
 @user_router.post("/admin/registration")
-def register_admin(user: dict, session: Session = Depends(get_session)):
+def register_admin(user: dict, session: Session = Depends(get_session, scope="function")):
     logger.info("Admin registration API called")
     logger.debug(f"Request data: {user}")
     user_data = UserValidator.validate_creation(user)
@@ -26,21 +31,21 @@ def register_admin(user: dict, session: Session = Depends(get_session)):
 
 @user_router.post("/login")
 def login(email: str = Header(description="User email address"),password: str = Header(description="User password"),
-          session: Session = Depends(get_session)):
+          session: Session = Depends(get_session, scope="function")):
     logger.info(f"Login attempt for email: {email}")
     token = UserService.login_user(session, email, password)
     logger.info("Login successful")
     return {"accessToken": token, "tokenType": "bearer"}
 
 @user_router.post("/logout")
-def logout(session: Session = Depends(get_session),current_user: User = Security(UserService.get_current_user)):
+def logout(session: Session = Depends(get_session, scope="function"),current_user: User = Security(UserService.get_current_user)):
     logger.info(f"Logout request for: {current_user.email}")
     UserRepository.log_logout(session, current_user.email)
     logger.info(f"{current_user.email} logged out successfully")
     return {"message": f"{current_user.email} logged out successfully"}
 
 @user_router.post("/employee/creation")
-def admin_employee_creation(creation: dict, session: Session = Depends(get_session),
+def admin_employee_creation(creation: dict, session: Session = Depends(get_session, scope="function"),
                             current_user: User = Security(UserService.get_current_user)):
     logger.info(f"Admin {current_user.email} requested employee creation")
     logger.debug(f"Employee creation raw data: {creation}")
@@ -60,7 +65,7 @@ def admin_employee_creation(creation: dict, session: Session = Depends(get_sessi
         }
 
 @user_router.get("/employee/details")
-def view_employee_details(current_user: User = Security(UserService.get_current_user), session: Session = Depends(get_session)):
+def view_employee_details(current_user: User = Security(UserService.get_current_user), session: Session = Depends(get_session, scope="function")):
     logger.info(f"Employee details requested for: {current_user.email}")
     condition_cheacking.check_its_employee(current_user.isSuperUser)
     employee = UserRepository.get_user_by_email(session, current_user.email)
@@ -79,7 +84,7 @@ def view_employee_details(current_user: User = Security(UserService.get_current_
     }
 
 @user_router.get("/admin/details")
-def view_admin_details(current_user: User = Security(UserService.get_current_user), session: Session = Depends(get_session)):
+def view_admin_details(current_user: User = Security(UserService.get_current_user), session: Session = Depends(get_session, scope="function")):
     logger.info(f"Admin details requested for: {current_user.email}")
     condition_cheacking.check_its_admin(current_user.isSuperUser)
     admin = UserRepository.get_user_by_email(session, current_user.email)
@@ -95,13 +100,15 @@ def view_admin_details(current_user: User = Security(UserService.get_current_use
         }
     }
 
-@user_router.get("/all/admin/details/views")
-def all_admin_details_views(current_user: User = Security(UserService.get_current_user), session: Session = Depends(get_session)):
-    logger.info("Admin requested all admin details")
-    condition_cheacking.check_its_admin(current_user.isSuperUser)
+def encode_json(content):
+    # Same encoding as JSONResponse, so coalesced responses are byte-for-byte what FastAPI would send.
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+def all_admin_details_body(session: Session):
     admin = UserRepository.get_all_admins(session)
     logger.info(f"Total admins found: {len(admin)}")
-    return {
+    return encode_json({
         "Role": "Admin",
         "Count": len(admin),
         "Details":[ {
@@ -115,16 +122,19 @@ def all_admin_details_views(current_user: User = Security(UserService.get_curren
             }
             for ad in admin
         ],
-        }
+        })
 
-@user_router.get("/admin/views/employee/details")
-def admin_view_employee_details(employeeEmail: Optional[str] = None, current_user: User = Security(UserService.get_current_user),
-                          session: Session = Depends(get_session)):
+@user_router.get("/all/admin/details/views")
+def all_admin_details_views(current_user: User = Security(UserService.get_current_user), session: Session = Depends(get_session, scope="function")):
+    logger.info("Admin requested all admin details")
     condition_cheacking.check_its_admin(current_user.isSuperUser)
-    logger.info(f"Admin {current_user.email} requested employee details for: {employeeEmail}")
+    body = user_reads.do(("all_admins",), lambda: all_admin_details_body(session))
+    return Response(content=body, media_type="application/json")
+
+def employee_details_body(session: Session, employeeEmail: Optional[str]):
     employee = UserRepository.get_all_or_single_employee(session, employeeEmail)
     condition_cheacking.check_employee(employee)
-    return {
+    return encode_json({
         "Role": "Employee Details",
         "Details": [
             {
@@ -138,11 +148,19 @@ def admin_view_employee_details(employeeEmail: Optional[str] = None, current_use
             }
             for emp in employee
         ],
-    }
+    })
+
+@user_router.get("/admin/views/employee/details")
+def admin_view_employee_details(employeeEmail: Optional[str] = None, current_user: User = Security(UserService.get_current_user),
+                          session: Session = Depends(get_session, scope="function")):
+    condition_cheacking.check_its_admin(current_user.isSuperUser)
+    logger.info(f"Admin {current_user.email} requested employee details for: {employeeEmail}")
+    body = user_reads.do(("employees", employeeEmail), lambda: employee_details_body(session, employeeEmail))
+    return Response(content=body, media_type="application/json")
 
 @user_router.get("/admin/views/all/not/active/admin/employee/details")
 def admin_view_not_active_employee_details(admin: Optional[bool] = None, current_user: User = Security(UserService.get_current_user),
-                          session: Session = Depends(get_session)):
+                          session: Session = Depends(get_session, scope="function")):
     condition_cheacking.check_its_admin(current_user.isSuperUser)
     logger.info("Admin requested inactive user list")
     users = UserRepository.get_all_not_active_user(session, admin)
@@ -163,8 +181,41 @@ def admin_view_not_active_employee_details(admin: Optional[bool] = None, current
         ],
     }
 
+@user_router.get("/admin/login/reports")
+def admin_login_reports(startDate: date, endDate: date, userEmail: Optional[str] = None,
+                        current_user: User = Security(UserService.get_current_user), session: Session = Depends(get_session, scope="function")):
+    condition_cheacking.check_its_admin(current_user.isSuperUser)
+    logger.info(f"Admin {current_user.email} requested login report")
+    summaries = LoginReportService.login_report(session, startDate, endDate, userEmail)
+    return {
+        "Role": "Login Report",
+        "Count": len(summaries),
+        "Details": [
+            {
+                "email": summary.userEmail,
+                "date": summary.dateOfLoginLogOut,
+                "first_login": summary.firstLogInTime,
+                "last_logout": summary.lastLogOutTime,
+                "login_count": summary.loginCount,
+                "worked_hours": LoginReportService.worked_hours(summary),
+            }
+            for summary in summaries
+        ],
+    }
+
+@user_router.get("/admin/login/reports/export")
+def admin_login_reports_export(startDate: date, endDate: date, userEmail: Optional[str] = None,
+                               current_user: User = Security(UserService.get_current_user)):
+    condition_cheacking.check_its_admin(current_user.isSuperUser)
+    logger.info(f"Admin {current_user.email} requested login report export")
+    return StreamingResponse(
+        LoginReportService.login_report_csv(startDate, endDate, userEmail),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="login_report_{startDate}_{endDate}.csv"'},
+    )
+
 @user_router.patch("/admin/profile/update")
-def admin_profile_update(data: dict, current_user: User = Security(UserService.get_current_user), session: Session = Depends(get_session)):
+def admin_profile_update(data: dict, current_user: User = Security(UserService.get_current_user), session: Session = Depends(get_session, scope="function")):
     condition_cheacking.check_its_admin(current_user.isSuperUser)
     logger.info(f"Admin profile update request from: {current_user.email}")
     admin_details = UserRepository.get_user_by_email(session, current_user.email)
@@ -187,7 +238,7 @@ def admin_profile_update(data: dict, current_user: User = Security(UserService.g
 
 @user_router.patch("/employee/profile/update")
 def employee_profile_update( data: dict, employeeEmail: Optional[str] =None, current_user: User = Security(UserService.get_current_user),
-                   session: Session = Depends(get_session)):
+                   session: Session = Depends(get_session, scope="function")):
     logger.info(f"Employee profile update request. Admin: {current_user.isSuperUser}, Target: {employeeEmail}")
     data = UserValidator.validate_update(data)
     employee = UserService.employee_update(data, employeeEmail ,current_user, session)
@@ -206,7 +257,7 @@ def employee_profile_update( data: dict, employeeEmail: Optional[str] =None, cur
 
 @user_router.delete("/admin/employee/deletion")
 def admin_or_employee_delete(adminOrEmployeeEmail: str,current_user: User = Security(UserService.get_current_user),
-                             session: Session = Depends(get_session)):
+                             session: Session = Depends(get_session, scope="function")):
     logger.warning(f"Admin {current_user.email} requested deletion of user: {adminOrEmployeeEmail}")
     admin = UserRepository.get_user_by_email(session, current_user.email)
     UserService.user_deletion(session,admin, adminOrEmployeeEmail)
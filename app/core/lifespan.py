@@ -2,6 +2,7 @@ from contextlib import asynccontextmanager
 from apscheduler.schedulers.background import BackgroundScheduler
 from app.config.database import init_db
 from app.services.user_service import UserService
+from app.services.login_report_service import LoginReportService
 
 scheduler = BackgroundScheduler()
 
@@ -11,9 +12,12 @@ async def lifespan(app):
 
     UserService.delete_inactivate_user_from_table()
     UserService.logout_user()
+    LoginReportService.rebuild_login_summaries()
+    LoginReportService.compact_login_history()
 
     scheduler.add_job(UserService.logout_user, "interval", minutes=2)
     scheduler.add_job(UserService.delete_inactivate_user_from_table, "interval", minutes=10)
+    scheduler.add_job(LoginReportService.compact_login_history, "interval", hours=24)
     scheduler.start()
 
     yield
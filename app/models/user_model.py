@@ -1,4 +1,4 @@
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, UniqueConstraint
 from typing import *
 from datetime import time, date , datetime
 
@@ -22,3 +22,13 @@ class LoginDetails(SQLModel, table=True):
     logOutTime: Optional[time] = None
     dateOfLoginLogOut: date 
     token:str 
+
+class LoginDailySummary(SQLModel, table=True):
+    __table_args__ = (UniqueConstraint("userEmail", "dateOfLoginLogOut"),)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    userEmail: str
+    dateOfLoginLogOut: date = Field(index=True)
+    firstLogInTime: time
+    lastLogOutTime: Optional[time] = None
+    loginCount: int = 0
+    workedSeconds: int = 0
@@ -0,0 +1,125 @@
+from sqlalchemy import case
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select, and_, or_
+from app.models.user_model import LoginDetails, LoginDailySummary
+from datetime import datetime, timedelta, date, time
+from typing import Optional
+
+class LoginReportRepository:
+    @staticmethod
+    def session_end(day: date, logInTime: time, logOutTime: time):
+        # A logout time earlier than the login time means the session ran past midnight.
+        end = datetime.combine(day, logOutTime)
+        if logOutTime < logInTime:
+            end += timedelta(days=1)
+        return end
+
+    @staticmethod
+    def get_daily_summary(session: Session, email: str, day: date):
+        return session.exec(select(LoginDailySummary).where(
+            and_(LoginDailySummary.userEmail == email, LoginDailySummary.dateOfLoginLogOut == day))).first()
+
+    @staticmethod
+    def record_login(session: Session, entry: LoginDetails):
+        # Upsert so two first logins of the day for the same user cannot both insert the summary row.
+        # ON CONFLICT comes from the SQLite dialect (DATABASE_URL is SQLite); the SET clause itself is portable.
+        statement = insert(LoginDailySummary).values(userEmail=entry.userEmail, dateOfLoginLogOut=entry.dateOfLoginLogOut,
+                                                     firstLogInTime=entry.logInTime, loginCount=1, workedSeconds=0)
+        statement = statement.on_conflict_do_update(
+            index_elements=["userEmail", "dateOfLoginLogOut"],
+            set_={
+                "firstLogInTime": case(
+                    (statement.excluded.firstLogInTime < LoginDailySummary.firstLogInTime, statement.excluded.firstLogInTime),
+                    else_=LoginDailySummary.firstLogInTime,
+                ),
+                "loginCount": LoginDailySummary.loginCount + 1,
+            },
+        )
+        session.exec(statement)
+
+    @staticmethod
+    def record_logout(session: Session, entry: LoginDetails):
+        # Sessions overlap and are not closed in start order, so the day is recomputed from its raw rows.
+        entries = session.exec(select(LoginDetails).where(
+            and_(LoginDetails.userEmail == entry.userEmail, LoginDetails.dateOfLoginLogOut == entry.dateOfLoginLogOut))).all()
+        return LoginReportRepository.rebuild_daily_summary(session, entry.userEmail, entry.dateOfLoginLogOut, entries)
+
+    @staticmethod
+    def rebuild_daily_summary(session: Session, email: str, day: date, entries):
+        # Raw rows are only ever removed a whole day at a time, so they are the full history of their day.
+        summary = LoginReportRepository.get_daily_summary(session, email, day)
+        if not summary:
+            summary = LoginDailySummary(userEmail=email, dateOfLoginLogOut=day, firstLogInTime=entries[0].logInTime)
+        summary.firstLogInTime = min(entry.logInTime for entry in entries)
+        summary.loginCount = len(entries)
+
+        # Worked time is the union of the closed sessions, so overlapping logins are only counted once.
+        intervals = sorted(
+            (datetime.combine(day, entry.logInTime), LoginReportRepository.session_end(day, entry.logInTime, entry.logOutTime))
+            for entry in entries if entry.logOutTime
+        )
+        worked = timedelta()
+        covered_until = None
+        for start, end in intervals:
+            if covered_until is None or start > covered_until:
+                worked += end - start
+                covered_until = end
+            elif end > covered_until:
+                worked += end - covered_until
+                covered_until = end
+        summary.workedSeconds = int(worked.total_seconds())
+        summary.lastLogOutTime = covered_until.time() if covered_until else None
+        session.add(summary)
+        return summary
+
+    @staticmethod
+    def group_by_day(entries):
+        days = {}
+        for entry in entries:
+            days.setdefault((entry.userEmail, entry.dateOfLoginLogOut), []).append(entry)
+        return days
+
+    @staticmethod
+    def rebuild_daily_summaries(session: Session):
+        days = LoginReportRepository.group_by_day(session.exec(select(LoginDetails)).all())
+        for (email, day), entries in days.items():
+            LoginReportRepository.rebuild_daily_summary(session, email, day, entries)
+        return len(days)
+
+    @staticmethod
+    def get_daily_summaries(session: Session, startDate: date, endDate: date, userEmail: Optional[str] = None,
+                            after: Optional[LoginDailySummary] = None, limit: Optional[int] = None):
+        query = select(LoginDailySummary).where(
+            and_(LoginDailySummary.dateOfLoginLogOut >= startDate, LoginDailySummary.dateOfLoginLogOut <= endDate))
+        if userEmail != None:
+            query = query.where(LoginDailySummary.userEmail == userEmail)
+        if after != None:
+            # Keyset paging on the (dateOfLoginLogOut, userEmail) order, which the unique constraint makes total.
+            query = query.where(or_(
+                LoginDailySummary.dateOfLoginLogOut > after.dateOfLoginLogOut,
+                and_(LoginDailySummary.dateOfLoginLogOut == after.dateOfLoginLogOut,
+                     LoginDailySummary.userEmail > after.userEmail)))
+        query = query.order_by(LoginDailySummary.dateOfLoginLogOut, LoginDailySummary.userEmail)
+        if limit != None:
+            query = query.limit(limit)
+        return session.exec(query).all()
+
+    @staticmethod
+    def delete_user_summaries(session: Session, email: str):
+        for summary in session.exec(select(LoginDailySummary).where(LoginDailySummary.userEmail == email)).all():
+            session.delete(summary)
+
+    @staticmethod
+    def compact_login_details(cutoff: date, session: Session):
+        days = LoginReportRepository.group_by_day(
+            session.exec(select(LoginDetails).where(LoginDetails.dateOfLoginLogOut < cutoff)).all())
+        compacted = 0
+        for (email, day), entries in days.items():
+            # A day with a session still open is left alone until update_logout_time closes it.
+            if any(entry.logOutTime is None for entry in entries):
+                continue
+            LoginReportRepository.rebuild_daily_summary(session, email, day, entries)
+            for entry in entries:
+                session.delete(entry)
+            compacted += len(entries)
+        return compacted
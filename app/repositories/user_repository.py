@@ -1,7 +1,28 @@
+from sqlalchemy import event
 from sqlmodel import Session, select, and_
 from app.models.user_model import User, LoginDetails
+from app.repositories.login_report_repository import LoginReportRepository
+from app.utils.single_flight import SingleFlight
 from datetime import datetime, timedelta
 
+USER_READS_CACHE_TTL_SECONDS = 2
+
+# Shared by the admin list views; every write to User below marks the session so the
+# cache is invalidated once that transaction commits.
+user_reads = SingleFlight(ttl=USER_READS_CACHE_TTL_SECONDS)
+
+def mark_user_reads_stale(session: Session):
+    session.info["user_reads_stale"] = True
+
+@event.listens_for(Session, "after_commit")
+def invalidate_user_reads(session: Session):
+    if session.info.pop("user_reads_stale", False):
+        user_reads.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def discard_user_reads_stale(session: Session):
+    session.info.pop("user_reads_stale", None)
+
 class UserRepository:
     @staticmethod
     def get_user_by_email(session: Session, email: str):
@@ -10,8 +31,8 @@ class UserRepository:
     @staticmethod
     def create_user(session: Session, user: User):
         session.add(user)
-        session.commit()
-        session.refresh(user)
+        session.flush()
+        mark_user_reads_stale(session)
         return user
 
     @staticmethod
@@ -42,7 +63,7 @@ class UserRepository:
             dateOfLoginLogOut=now.date(), token=token
         )
         session.add(login_entry)
-        session.commit()
+        LoginReportRepository.record_login(session, login_entry)
         return login_entry
 
     @staticmethod
@@ -51,7 +72,7 @@ class UserRepository:
         if entry and not entry.logOutTime:
             entry.logOutTime = datetime.now().time()
             session.add(entry)
-            session.commit()
+            LoginReportRepository.record_logout(session, entry)
         return entry
 
     @staticmethod
@@ -59,13 +80,13 @@ class UserRepository:
         user.isActive = False
         user.scheduledDeletion = datetime.now() + timedelta(minutes=10)
         session.add(user)
-        session.commit()
+        mark_user_reads_stale(session)
     
     @staticmethod
     def employee_details_add(session: Session, employee: User):
         session.add(employee)
-        session.commit()
-        session.refresh(employee)
+        session.flush()
+        mark_user_reads_stale(session)
         return employee
 
     @staticmethod
@@ -73,8 +94,8 @@ class UserRepository:
         for key, value in update_data.items():
             setattr(user, key, value)
         session.add(user)
-        session.commit()
-        session.refresh(user)
+        session.flush()
+        mark_user_reads_stale(session)
         return user
     
     @staticmethod
@@ -84,8 +105,10 @@ class UserRepository:
             login_records = session.exec(select(LoginDetails).where(LoginDetails.userEmail == user.email)).all()
             for login in login_records:
                 session.delete(login)
+            LoginReportRepository.delete_user_summaries(session, user.email)
             session.delete(user)
-        session.commit()
+        if users_to_delete:
+            mark_user_reads_stale(session)
 
     @staticmethod
     def update_logout_time(now, session):
@@ -98,6 +121,4 @@ class UserRepository:
             if token_expiry_time <= now:
                 entry.logOutTime = token_expiry_time.time()
                 session.add(entry)
-
-        session.commit()
-   
\ No newline at end of file
+                LoginReportRepository.record_logout(session, entry)
\ No newline at end of file
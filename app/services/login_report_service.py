@@ -0,0 +1,80 @@
+import csv
+import io
+from datetime import datetime, timedelta, date
+from typing import Optional
+from sqlmodel import Session
+from app.repositories.login_report_repository import LoginReportRepository
+from app.config.database import get_engine, session_scope
+from app.utils import condition_cheacking
+import logging
+
+logger = logging.getLogger(__name__)
+
+LOGIN_HISTORY_RETENTION_DAYS = 30
+LOGIN_REPORT_EXPORT_CHUNK_SIZE = 500
+LOGIN_REPORT_CSV_HEADER = ["email", "date", "first_login", "last_logout", "login_count", "worked_hours"]
+
+class LoginReportService:
+
+    @staticmethod
+    def worked_hours(summary):
+        return round(summary.workedSeconds / 3600, 2)
+
+    @staticmethod
+    def login_report(session, startDate: date, endDate: date, userEmail: Optional[str] = None):
+        condition_cheacking.check_date_range(startDate, endDate)
+        logger.info(f"Login report requested from {startDate} to {endDate} for: {userEmail or 'all users'}")
+        return LoginReportRepository.get_daily_summaries(session, startDate, endDate, userEmail)
+
+    @staticmethod
+    def login_report_csv(startDate: date, endDate: date, userEmail: Optional[str] = None):
+        # Validated here rather than in the generator so a bad range fails before the response starts.
+        condition_cheacking.check_date_range(startDate, endDate)
+        logger.info(f"Login report export from {startDate} to {endDate} for: {userEmail or 'all users'}")
+        return LoginReportService.login_report_csv_chunks(startDate, endDate, userEmail)
+
+    @staticmethod
+    def login_report_csv_chunks(startDate: date, endDate: date, userEmail: Optional[str] = None):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(LOGIN_REPORT_CSV_HEADER)
+        yield buffer.getvalue()
+
+        # The request session is closed once the endpoint returns, so the stream reads through its own.
+        with Session(get_engine()) as session:
+            last_seen = None
+            while True:
+                summaries = LoginReportRepository.get_daily_summaries(session, startDate, endDate, userEmail,
+                                                                      last_seen, LOGIN_REPORT_EXPORT_CHUNK_SIZE)
+                if not summaries:
+                    break
+                buffer.seek(0)
+                buffer.truncate(0)
+                for summary in summaries:
+                    writer.writerow([
+                        summary.userEmail,
+                        summary.dateOfLoginLogOut.isoformat(),
+                        summary.firstLogInTime.isoformat(),
+                        summary.lastLogOutTime.isoformat() if summary.lastLogOutTime else "",
+                        summary.loginCount,
+                        LoginReportService.worked_hours(summary),
+                    ])
+                yield buffer.getvalue()
+                if len(summaries) < LOGIN_REPORT_EXPORT_CHUNK_SIZE:
+                    break
+                last_seen = summaries[-1]
+
+    @staticmethod
+    def rebuild_login_summaries():
+        logger.info("Rebuilding daily login summaries from login history")
+        with session_scope() as session:
+            rebuilt = LoginReportRepository.rebuild_daily_summaries(session)
+        logger.info(f"Daily login summaries rebuilt: {rebuilt}")
+
+    @staticmethod
+    def compact_login_history():
+        cutoff = datetime.now().date() - timedelta(days=LOGIN_HISTORY_RETENTION_DAYS)
+        logger.info(f"Compacting login history older than {cutoff}")
+        with session_scope() as session:
+            compacted = LoginReportRepository.compact_login_details(cutoff, session)
+        logger.info(f"Login history rows compacted: {compacted}")
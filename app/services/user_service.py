@@ -7,7 +7,7 @@ from sqlmodel import Session
 from fastapi.security import OAuth2PasswordBearer
 from app.repositories.user_repository import UserRepository
 from app.models.user_model import User
-from app.config.database import get_session, get_engine
+from app.config.database import get_session, session_scope
 import logging
 
 logger = logging.getLogger(__name__)
@@ -57,7 +57,7 @@ class UserService:
             raise HTTPException(status_code=401, detail="Invalid token")
         
     @staticmethod
-    def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)):
+    def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session, scope="function")):
         not_logged_in = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail="User is not logged in or token is invalid",
                                     headers={"WWW-Authenticate": "Bearer"})
         logger.info("Validating current user from token")
@@ -199,14 +199,13 @@ class UserService:
     @staticmethod
     def delete_inactivate_user_from_table():
         logger.info("Starting cleanup for inactive users")
-        engine = get_engine()
         now = datetime.now()
-        with Session(engine) as session:
+        with session_scope() as session:
             UserRepository.cleanup_inactive_users(now, session)
         
     @staticmethod
     def logout_user():
         logger.info("Running logout cleanup")
         now = datetime.now()
-        with next(get_session()) as session:
+        with session_scope() as session:
             UserRepository.update_logout_time(now, session)
\ No newline at end of file
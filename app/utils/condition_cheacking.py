@@ -13,4 +13,8 @@ def check_employee(employee):
     
 def check_not_active_user(users):
     if not users:
-        raise HTTPException(status_code=404, detail="User not found")
\ No newline at end of file
+        raise HTTPException(status_code=404, detail="User not found")
+
+def check_date_range(startDate, endDate):
+    if startDate > endDate:
+        raise HTTPException(status_code=400, detail="startDate must be on or before endDate")
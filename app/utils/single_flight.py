@@ -0,0 +1,61 @@
+import threading
+import time
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    # Concurrent callers of do() with the same key share one call to fn. With ttl > 0 the result
+    # is also kept for ttl seconds; invalidate() drops both cached and in-flight results.
+    def __init__(self, ttl: float = 0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._cache = {}
+        self._generation = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached:
+                expires_at, result = cached
+                if expires_at > time.monotonic():
+                    return result
+                del self._cache[key]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                generation = self._generation
+
+        if not leader:
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                if call.error is None and self.ttl > 0 and generation == self._generation:
+                    if len(self._cache) >= self.max_entries:
+                        self._cache.clear()
+                    self._cache[key] = (time.monotonic() + self.ttl, call.result)
+            call.done.set()
+        return call.result
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._calls.clear()
+            self._cache.clear()
@@ -0,0 +1,74 @@
+from datetime import date, time
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine, select
+from app.models.user_model import LoginDetails, LoginDailySummary
+from app.repositories.login_report_repository import LoginReportRepository
+
+DAY = date(2026, 10, 1)
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    return Session(engine)
+
+def log_in(session, logInTime):
+    entry = LoginDetails(userEmail="emp@example.com", logInTime=logInTime, dateOfLoginLogOut=DAY, token="t")
+    session.add(entry)
+    session.flush()
+    LoginReportRepository.record_login(session, entry)
+    return entry
+
+def log_out(session, entry, logOutTime):
+    entry.logOutTime = logOutTime
+    session.add(entry)
+    LoginReportRepository.record_logout(session, entry)
+
+def summary(session):
+    return session.exec(select(LoginDailySummary)).one()
+
+def test_overlapping_sessions_are_counted_once():
+    with make_session() as session:
+        first = log_in(session, time(9, 0))
+        second = log_in(session, time(9, 8))
+        log_out(session, first, time(9, 10))
+        log_out(session, second, time(9, 18))
+        result = summary(session)
+        assert result.loginCount == 2
+        assert result.workedSeconds == 18 * 60
+        assert result.lastLogOutTime == time(9, 18)
+
+def test_sessions_closed_out_of_order():
+    with make_session() as session:
+        first = log_in(session, time(14, 0))
+        second = log_in(session, time(14, 5))
+        log_out(session, second, time(14, 12))
+        log_out(session, first, time(14, 10))
+        assert summary(session).workedSeconds == 12 * 60
+
+def test_disjoint_and_midnight_sessions_add_up():
+    with make_session() as session:
+        log_out(session, log_in(session, time(9, 0)), time(9, 30))
+        log_out(session, log_in(session, time(23, 50)), time(0, 10))
+        result = summary(session)
+        assert result.workedSeconds == 50 * 60
+        assert result.lastLogOutTime == time(0, 10)
+
+def test_compaction_rebuilds_day_from_raw_rows():
+    with make_session() as session:
+        for logInTime, logOutTime in [(time(8), time(9)), (time(10), time(12)), (time(11), time(12, 30))]:
+            session.add(LoginDetails(userEmail="emp@example.com", logInTime=logInTime, logOutTime=logOutTime,
+                                     dateOfLoginLogOut=DAY, token="t"))
+        session.flush()
+        assert LoginReportRepository.compact_login_details(date(2026, 10, 2), session) == 3
+        result = summary(session)
+        assert (result.loginCount, result.workedSeconds) == (3, int(3.5 * 3600))
+        assert session.exec(select(LoginDetails)).all() == []
+
+def test_login_upsert_keeps_earliest_login():
+    with make_session() as session:
+        log_in(session, time(10, 0))
+        log_in(session, time(8, 30))
+        log_in(session, time(9, 0))
+        result = summary(session)
+        session.refresh(result)
+        assert (result.loginCount, result.firstLogInTime) == (3, time(8, 30))